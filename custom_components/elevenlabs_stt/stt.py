@@ -1,14 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from collections.abc import AsyncIterable
-import wave
-import io
-import json
-import requests
+import struct
+import httpx
+import orjson
 
-import async_timeout
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.components.stt import (
     AudioBitRates,
     AudioChannels,
@@ -104,8 +104,128 @@ SUPPORTED_LANGUAGES = [
     "cy",  # Welsh
 ]
 
+# O(1) membership checks; the list above stays the public sequence form
+# Home Assistant expects from supported_languages.
+_SUPPORTED_LANGUAGES_SET = frozenset(SUPPORTED_LANGUAGES)
+
+# Map Home Assistant language codes (ISO 639-1) to ElevenLabs language codes
+# (ISO 639-2). Built once at import time; "auto" maps to None (auto-detect).
+_LANG_MAP: dict[str, str | None] = {
+    "auto": None,  # Auto-detect
+    "en": "eng",
+    "fr": "fra",
+    "de": "deu",
+    "it": "ita",
+    "es": "spa",
+    "pt": "por",
+    "pl": "pol",
+    "nl": "nld",
+    "ru": "rus",
+    "ja": "jpn",
+    "zh": "cmn",
+    "ko": "kor",
+    "hi": "hin",
+    "ar": "ara",
+    "tr": "tur",
+    "sv": "swe",
+    "fi": "fin",
+    "da": "dan",
+    "no": "nor",
+    "cs": "ces",
+    "hu": "hun",
+    "el": "ell",
+    "ro": "ron",
+    "bg": "bul",
+    "hr": "hrv",
+    "uk": "ukr",
+    "he": "heb",
+    "ca": "cat",
+    "sk": "slk",
+    "lt": "lit",
+    "et": "est",
+    "lv": "lav",
+    "sl": "slv",
+    "cy": "cym",
+    "id": "ind",
+    "ms": "msa",
+    "vi": "vie",
+    "th": "tha",
+    "bn": "ben",
+    "ta": "tam",
+    "te": "tel",
+    "mr": "mar",
+    "kn": "kan",
+    "ml": "mal",
+    "gu": "guj",
+    "pa": "pan",
+    "ur": "urd",
+    "fa": "fas",
+    "sw": "swh",
+}
+
+# Capability constants returned by the supported_* properties. Home Assistant
+# queries these repeatedly during pipeline setup, so share one tuple per
+# property instead of allocating a fresh list on every access.
+_SUPPORTED_FORMATS = (AudioFormats.WAV, AudioFormats.OGG)
+_SUPPORTED_CODECS = (AudioCodecs.PCM, AudioCodecs.OPUS)
+_SUPPORTED_BIT_RATES = (AudioBitRates.BITRATE_16,)
+_SUPPORTED_SAMPLE_RATES = (
+    AudioSampleRates.SAMPLERATE_8000,
+    AudioSampleRates.SAMPLERATE_16000,
+    AudioSampleRates.SAMPLERATE_22000,
+    AudioSampleRates.SAMPLERATE_44100,
+    AudioSampleRates.SAMPLERATE_48000,
+)
+_SUPPORTED_CHANNELS = (AudioChannels.CHANNEL_MONO, AudioChannels.CHANNEL_STEREO)
+
 MODEL_SCHEMA = vol.In(SUPPORTED_MODELS)
 
+# Multipart framing. The boundary is static so the envelope around the audio
+# can be rendered once per provider instead of re-encoded on every request;
+# at 38 random-looking bytes a collision with PCM payload is not a concern.
+_BOUNDARY = "ha-elevenlabs-stt-9f2c7d1e5b8a4063c41d"
+_MULTIPART_CONTENT_TYPE = f"multipart/form-data; boundary={_BOUNDARY}"
+_UPLOAD_CHUNK = 64 * 1024
+
+
+def _form_field(name: str, value: str) -> bytes:
+    """Render one pre-encoded multipart form field."""
+    return (
+        f"--{_BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="{name}"\r\n'
+        f"\r\n"
+        f"{value}\r\n"
+    ).encode()
+
+
+_FILE_PART_HEADER = (
+    f"--{_BOUNDARY}\r\n"
+    'Content-Disposition: form-data; name="file"; filename="audio.wav"\r\n'
+    "Content-Type: audio/wav\r\n"
+    "\r\n"
+).encode()
+_MULTIPART_SUFFIX = f"\r\n--{_BOUNDARY}--\r\n".encode()
+
+
+def _wav_header(data_size: int, channels: int, sampwidth: int, rate: int) -> bytes:
+    """Build the 44-byte RIFF/fmt/data header for a PCM WAV of known size."""
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt chunk size
+        1,  # PCM
+        channels,
+        rate,
+        rate * channels * sampwidth,  # byte rate
+        channels * sampwidth,  # block align
+        sampwidth * 8,
+        b"data",
+        data_size,
+    )
+
 PLATFORM_SCHEMA = cv.PLATFORM_SCHEMA.extend({
     vol.Required(CONF_API_KEY): cv.string,
     vol.Optional(CONF_API_URL, default=DEFAULT_API_URL): cv.string,
@@ -125,7 +245,18 @@ async def async_get_engine(hass, config, discovery_info=None):
     diarize = config.get(CONF_DIARIZE, DEFAULT_DIARIZE)
     tag_audio_events = config.get(CONF_TAG_AUDIO_EVENTS, DEFAULT_TAG_AUDIO_EVENTS)
 
-    return ElevenLabsSTTProvider(hass, api_key, api_url, model, language, diarize, tag_audio_events)
+    provider = ElevenLabsSTTProvider(hass, api_key, api_url, model, language, diarize, tag_audio_events)
+
+    # Warm up DNS + TCP + TLS to the API in the background so the first
+    # real transcription after a restart skips the handshake.
+    hass.async_create_background_task(provider._async_prewarm(), "elevenlabs_stt_prewarm")
+
+    async def _async_close(event) -> None:
+        await provider.async_close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close)
+
+    return provider
 
 
 class ElevenLabsSTTProvider(Provider):
@@ -140,180 +271,175 @@ class ElevenLabsSTTProvider(Provider):
         self._api_url = api_url
         self._model = model
         self._language = language
+        self._default_el_lang = _LANG_MAP.get(language)
         self._diarize = diarize
         self._tag_audio_events = tag_audio_events
 
+        # Pre-render the static multipart parts; only the PCM payload and an
+        # occasional language override change between requests.
+        self._multipart_prefix = b"".join((
+            _form_field("model_id", model),
+            _form_field("diarize", "true" if diarize else "false"),
+            _form_field("tag_audio_events", "true" if tag_audio_events else "false"),
+        ))
+        self._default_lang_field = (
+            _form_field("language_code", self._default_el_lang)
+            if self._default_el_lang is not None
+            else b""
+        )
+
+        # Reuse one client (and its TCP+TLS connections) across STT requests
+        # instead of paying a fresh handshake per utterance. HTTP/2 lets
+        # back-to-back calls multiplex over a single kept-alive connection.
+        self._client = httpx.AsyncClient(
+            base_url=api_url,
+            http2=True,
+            # Per-phase budgets: fail fast on connect problems instead of
+            # burning the whole request budget before a retry can happen.
+            timeout=httpx.Timeout(connect=3.0, read=27.0, write=10.0, pool=2.0),
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=300.0),
+            headers={
+                "xi-api-key": api_key,
+                "Accept": "application/json",
+            },
+        )
+
+    async def async_close(self) -> None:
+        """Close the pooled HTTP client."""
+        await self._client.aclose()
+
+    async def _multipart_body(
+        self,
+        wav_header: bytes,
+        pcm: bytearray,
+        language_code: str,
+        elevenlabs_language_code: str | None,
+    ) -> AsyncIterable[bytes]:
+        """Yield the pre-rendered multipart envelope around the PCM.
+
+        An async generator, as AsyncClient refuses sync byte iterators. A
+        regular method taking plain arguments: unlike a per-call closure it
+        allocates no cell variables, and the PCM buffer becomes collectable
+        as soon as the upload finishes.
+        """
+        yield self._multipart_prefix
+        if elevenlabs_language_code is self._default_el_lang:
+            yield self._default_lang_field
+        elif language_code != "auto" and elevenlabs_language_code is not None:
+            yield _form_field("language_code", elevenlabs_language_code)
+        yield _FILE_PART_HEADER
+        yield wav_header
+        view = memoryview(pcm)
+        for i in range(0, len(view), _UPLOAD_CHUNK):
+            yield bytes(view[i:i + _UPLOAD_CHUNK])
+        yield _MULTIPART_SUFFIX
+
+    async def _async_prewarm(self) -> None:
+        """Pre-establish the HTTPS connection so it sits warm in the pool."""
+        try:
+            await self._client.head("/models")
+        except Exception as e:
+            _LOGGER.debug("ElevenLabs STT pre-warm failed: %s", str(e))
+
     @property
     def supported_languages(self) -> list[str]:
         """Return a list of supported languages."""
         return SUPPORTED_LANGUAGES
 
     @property
-    def supported_formats(self) -> list[AudioFormats]:
+    def supported_formats(self) -> tuple[AudioFormats, ...]:
         """Return a list of supported formats."""
-        return [AudioFormats.WAV, AudioFormats.OGG]
+        return _SUPPORTED_FORMATS
 
     @property
-    def supported_codecs(self) -> list[AudioCodecs]:
+    def supported_codecs(self) -> tuple[AudioCodecs, ...]:
         """Return a list of supported codecs."""
-        return [AudioCodecs.PCM, AudioCodecs.OPUS]
+        return _SUPPORTED_CODECS
 
     @property
-    def supported_bit_rates(self) -> list[AudioBitRates]:
+    def supported_bit_rates(self) -> tuple[AudioBitRates, ...]:
         """Return a list of supported bitrates."""
-        return [AudioBitRates.BITRATE_16]
+        return _SUPPORTED_BIT_RATES
 
     @property
-    def supported_sample_rates(self) -> list[AudioSampleRates]:
+    def supported_sample_rates(self) -> tuple[AudioSampleRates, ...]:
         """Return a list of supported samplerates."""
-        return [
-            AudioSampleRates.SAMPLERATE_8000,
-            AudioSampleRates.SAMPLERATE_16000,
-            AudioSampleRates.SAMPLERATE_22000,
-            AudioSampleRates.SAMPLERATE_44100,
-            AudioSampleRates.SAMPLERATE_48000,
-        ]
+        return _SUPPORTED_SAMPLE_RATES
 
     @property
-    def supported_channels(self) -> list[AudioChannels]:
+    def supported_channels(self) -> tuple[AudioChannels, ...]:
         """Return a list of supported channels."""
-        return [AudioChannels.CHANNEL_MONO, AudioChannels.CHANNEL_STEREO]
+        return _SUPPORTED_CHANNELS
 
     async def async_process_audio_stream(
             self, metadata: SpeechMetadata, stream: AsyncIterable[bytes]
     ) -> SpeechResult:
         """Process an audio stream to STT service."""
-        # Collect audio data
-        audio_data = b""
+        # Collect the raw PCM; bytearray.extend amortizes like list.append
+        # instead of recopying the whole buffer on every chunk.
+        pcm = bytearray()
         async for chunk in stream:
-            audio_data += chunk
-
-        # Prepare the audio file in the correct format
-        audio_stream = io.BytesIO()
-
-        with wave.open(audio_stream, 'wb') as wf:
-            wf.setnchannels(metadata.channel)
-            wf.setsampwidth(metadata.bit_rate // 8)
-            wf.setframerate(metadata.sample_rate)
-            wf.writeframes(audio_data)
-
-        audio_stream.seek(0)  # Reset file pointer to beginning
-
-        # Determine language parameter
-        language_code = metadata.language if metadata.language != "auto" else self._language
-
-        # Map Home Assistant language codes (ISO 639-1) to ElevenLabs language codes (ISO 639-2)
-        language_map = {
-            "auto": None,  # Auto-detect
-            "en": "eng",
-            "fr": "fra",
-            "de": "deu",
-            "it": "ita",
-            "es": "spa",
-            "pt": "por",
-            "pl": "pol",
-            "nl": "nld",
-            "ru": "rus",
-            "ja": "jpn",
-            "zh": "cmn",
-            "ko": "kor",
-            "hi": "hin",
-            "ar": "ara",
-            "tr": "tur",
-            "sv": "swe",
-            "fi": "fin",
-            "da": "dan",
-            "no": "nor",
-            "cs": "ces",
-            "hu": "hun",
-            "el": "ell",
-            "ro": "ron",
-            "bg": "bul",
-            "hr": "hrv",
-            "uk": "ukr",
-            "he": "heb",
-            "ca": "cat",
-            "sk": "slk",
-            "lt": "lit",
-            "et": "est",
-            "lv": "lav",
-            "sl": "slv",
-            "cy": "cym",
-            "id": "ind",
-            "ms": "msa",
-            "vi": "vie",
-            "th": "tha",
-            "bn": "ben",
-            "ta": "tam",
-            "te": "tel",
-            "mr": "mar",
-            "kn": "kan",
-            "ml": "mal",
-            "gu": "guj",
-            "pa": "pan",
-            "ur": "urd",
-            "fa": "fas",
-            "sw": "swh",
-        }
-
-        # Convert language code to ElevenLabs format if it exists in our mapping
-        elevenlabs_language_code = language_map.get(language_code)
-
-        def job():
-            url = f"{self._api_url}/speech-to-text"
-
-            headers = {
-                "xi-api-key": self._api_key,
-                "Accept": "application/json"
-            }
-
-            data = {
-                'model_id': self._model,
-                'diarize': str(self._diarize).lower(),
-                'tag_audio_events': str(self._tag_audio_events).lower(),
-            }
-
-            # Only add language if not auto
-            if language_code != "auto" and elevenlabs_language_code is not None:
-                data['language_code'] = elevenlabs_language_code
-
-            files = {
-                'file': ('audio.wav', audio_stream, 'audio/wav'),
-            }
-
-            try:
-                response = requests.post(
-                    url,
-                    headers=headers,
-                    files=files,
-                    data=data  # Przekazujemy dane jako część formularza, nie jako parametry URL
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    return result
-                else:
-                    _LOGGER.error(
-                        "ElevenLabs STT request failed with status %s: %s",
-                        response.status_code,
-                        response.text,
-                    )
-                    return None
-            except Exception as e:
-                _LOGGER.error(
-                    "ElevenLabs STT request failed: %s",
-                    str(e),
+            pcm.extend(chunk)
+
+        # The input is already PCM, so instead of re-encoding through the
+        # wave module just prepend a hand-assembled RIFF header.
+        wav_header = _wav_header(
+            len(pcm), metadata.channel, metadata.bit_rate // 8, metadata.sample_rate
+        )
+
+        # Determine language parameter. Requests almost always carry the
+        # configured language, so reuse its ElevenLabs code precomputed in
+        # __init__ and only hit _LANG_MAP for overrides.
+        if metadata.language in (None, "auto", self._language):
+            language_code = self._language
+            elevenlabs_language_code = self._default_el_lang
+        else:
+            language_code = metadata.language
+            elevenlabs_language_code = (
+                _LANG_MAP.get(language_code)
+                if language_code in _SUPPORTED_LANGUAGES_SET
+                else None
+            )
+
+        try:
+            async with asyncio.timeout(30):  # Longer timeout for STT processing
+                response = await self._client.post(
+                    "/speech-to-text",
+                    content=self._multipart_body(
+                        wav_header, pcm, language_code, elevenlabs_language_code
+                    ),
+                    headers={"Content-Type": _MULTIPART_CONTENT_TYPE},
                 )
-                return None
-
-        async with async_timeout.timeout(30):  # Longer timeout for STT processing
-            assert self.hass
-            response = await self.hass.async_add_executor_job(job)
-
-            if response and "text" in response:
-                return SpeechResult(
-                    response["text"],
-                    SpeechResultState.SUCCESS,
-                )
-
-            return SpeechResult("", SpeechResultState.ERROR)
\ No newline at end of file
+        except Exception as e:
+            _LOGGER.error(
+                "ElevenLabs STT request failed: %s",
+                str(e),
+            )
+            return SpeechResult("", SpeechResultState.ERROR)
+
+        if response.status_code != 200:
+            _LOGGER.error(
+                "ElevenLabs STT request failed with status %s: %s",
+                response.status_code,
+                response.text,
+            )
+            return SpeechResult("", SpeechResultState.ERROR)
+
+        # The transcript payload can run to tens of KB with diarization on;
+        # orjson parses it several times faster than stdlib json.
+        try:
+            result = orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            _LOGGER.error(
+                "ElevenLabs STT returned an invalid JSON response: %s",
+                str(e),
+            )
+            return SpeechResult("", SpeechResultState.ERROR)
+
+        if result and "text" in result:
+            return SpeechResult(
+                result["text"],
+                SpeechResultState.SUCCESS,
+            )
+
+        return SpeechResult("", SpeechResultState.ERROR)
\ No newline at end of file